@@ -6,14 +6,72 @@ endpoints, models, and documentation for automatic documentation generation.
 """
 
 import ast
+import hashlib
 import os
+import pickle
+import pickletools
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+# Bump to invalidate previously cached parse results when the analyzer changes
+CACHE_VERSION = 4
 
-@dataclass
+# Directories that never contain application code worth analyzing
+SKIP_DIRS = {'__pycache__', 'venv', 'node_modules'}
+
+# Below this many files, process startup costs more than it saves
+PARALLEL_THRESHOLD = 4
+
+# FastAPI() keyword arguments worth carrying into the analysis
+APP_INFO_KEYS = frozenset({'title', 'description', 'version'})
+
+# Route decorator attributes mapped to their HTTP method names
+HTTP_METHODS = {
+    'get': 'GET',
+    'post': 'POST',
+    'put': 'PUT',
+    'delete': 'DELETE',
+    'patch': 'PATCH',
+}
+
+# Sentinel distinguishing "not a constant node" from a literal None value
+_MISSING = object()
+
+
+def _const(node: ast.expr) -> Any:
+    """Return the literal value of an ast.Constant node, or _MISSING"""
+    return node.value if type(node) is ast.Constant else _MISSING
+
+
+def _iter_python_files(directory_path: str):
+    """Yield (path, mtime_ns) of .py files under directory_path, pruning hidden and vendored dirs"""
+    try:
+        entries = os.scandir(directory_path)
+    except OSError:
+        # Missing or unreadable directory: skip it, as os.walk did by default
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.startswith('.') or entry.name in SKIP_DIRS:
+                    continue
+                yield from _iter_python_files(entry.path)
+            elif entry.name.endswith('.py'):
+                # DirEntry.stat reuses data the scandir call already fetched
+                try:
+                    mtime_ns = entry.stat().st_mtime_ns
+                except OSError:
+                    # Dangling symlink or racing delete: yield a sentinel so
+                    # analyze_file reports the error instead of the scan dying
+                    mtime_ns = None
+                yield entry.path, mtime_ns
+
+
+@dataclass(slots=True)
 class APIEndpoint:
     """Represents a single API endpoint"""
     path: str
@@ -35,7 +93,7 @@ class APIEndpoint:
             self.tags = []
 
 
-@dataclass
+@dataclass(slots=True)
 class APIModel:
     """Represents a Pydantic model"""
     name: str
@@ -44,7 +102,7 @@ class APIModel:
     example: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class APIAnalysis:
     """Complete analysis of a FastAPI application"""
     endpoints: List[APIEndpoint]
@@ -54,64 +112,131 @@ class APIAnalysis:
     app_version: Optional[str] = None
 
 
-class FastAPIAnalyzer:
+class FastAPIAnalyzer(ast.NodeVisitor):
     """Analyzes FastAPI applications to extract API definitions"""
     
-    def __init__(self):
-        self.endpoints: List[APIEndpoint] = []
-        self.models: List[APIModel] = []
-        self.app_info: Dict[str, Any] = {}
-    
+    def __init__(self, cache_dir: str = ".autodocgen-cache"):
+        self.cache_dir = cache_dir
+        self._memory_cache: Dict[str, APIAnalysis] = {}
+        self._file_state: Dict[str, Tuple[int, APIAnalysis]] = {}
+        self._last_directory: Optional[str] = None
+
     def analyze_file(self, file_path: str) -> APIAnalysis:
         """Analyze a single Python file for FastAPI definitions"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
-            
-            # Extract app info and endpoints
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    self._analyze_assignment(node)
-                elif isinstance(node, ast.FunctionDef):
-                    self._analyze_function(node)
-                elif isinstance(node, ast.ClassDef):
-                    self._analyze_class(node)
-            
-            return APIAnalysis(
-                endpoints=self.endpoints,
-                models=self.models,
-                app_title=self.app_info.get('title'),
-                app_description=self.app_info.get('description'),
-                app_version=self.app_info.get('version')
-            )
-            
+            # Raw bytes skip Python-side text decoding; ast.parse handles the
+            # BOM and coding cookie itself, and the hash works on bytes anyway
+            with open(file_path, 'rb') as f:
+                source = f.read()
+
+            cache_key = self._cache_key(source)
+            analysis = self._memory_cache.get(cache_key)
+            if analysis is not None:
+                return analysis
+
+            analysis = self._load_cached_analysis(cache_key)
+            if analysis is None:
+                tree = ast.parse(source, filename=file_path)
+
+                endpoints: List[APIEndpoint] = []
+                models: List[APIModel] = []
+                app_info: Dict[str, Any] = {}
+
+                # Extract app info and endpoints. FastAPI app creation, route
+                # functions and Pydantic models are all module-level statements,
+                # so a single pass over tree.body avoids descending into
+                # function bodies and expressions the way ast.walk does.
+                for node in tree.body:
+                    result = self.visit(node)
+                    if result is None:
+                        continue
+                    if isinstance(result, list):
+                        endpoints.extend(result)
+                    elif isinstance(result, APIModel):
+                        models.append(result)
+                    else:
+                        app_info.update(result)
+
+                analysis = APIAnalysis(
+                    endpoints=endpoints,
+                    models=models,
+                    app_title=app_info.get('title'),
+                    app_description=app_info.get('description'),
+                    app_version=app_info.get('version')
+                )
+                self._store_cached_analysis(cache_key, analysis)
+
+            self._memory_cache[cache_key] = analysis
+            return analysis
+
         except Exception as e:
             print(f"Error analyzing file {file_path}: {e}")
             return APIAnalysis(endpoints=[], models=[])
-    
+
+    def _cache_key(self, source: bytes) -> str:
+        """Build a cache key from the source bytes, Python version and analyzer version"""
+        digest = hashlib.sha256(source)
+        digest.update(f"py{sys.version_info.major}.{sys.version_info.minor}-v{CACHE_VERSION}".encode())
+        return digest.hexdigest()
+
+    def _load_cached_analysis(self, cache_key: str) -> Optional[APIAnalysis]:
+        """Load a previously computed APIAnalysis from the on-disk cache, if present"""
+        cache_path = os.path.join(self.cache_dir, f"{cache_key}.pkl")
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _store_cached_analysis(self, cache_key: str, analysis: APIAnalysis):
+        """Persist a computed APIAnalysis to the on-disk cache"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            payload = pickletools.optimize(pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL))
+            with open(os.path.join(self.cache_dir, f"{cache_key}.pkl"), 'wb') as f:
+                f.write(payload)
+        except (OSError, pickle.PickleError):
+            pass  # Caching is best-effort; analysis still succeeded
+
     def analyze_directory(self, directory_path: str) -> APIAnalysis:
-        """Analyze all Python files in a directory"""
+        """Analyze all Python files in a directory, re-parsing only changed files"""
         all_endpoints = []
         all_models = []
         app_info = {}
-        
-        for root, dirs, files in os.walk(directory_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    analysis = self.analyze_file(file_path)
-                    
-                    all_endpoints.extend(analysis.endpoints)
-                    all_models.extend(analysis.models)
-                    
-                    if analysis.app_title:
-                        app_info['title'] = analysis.app_title
-                    if analysis.app_description:
-                        app_info['description'] = analysis.app_description
-                    if analysis.app_version:
-                        app_info['version'] = analysis.app_version
+
+        self._last_directory = directory_path
+        file_info = list(_iter_python_files(directory_path))
+
+        # Only files whose mtime changed since the last run need re-analysis
+        stale = []
+        for file_path, mtime_ns in file_info:
+            cached = self._file_state.get(file_path)
+            if cached is None or cached[0] != mtime_ns:
+                stale.append((file_path, mtime_ns))
+
+        stale_paths = [file_path for file_path, _ in stale]
+        if len(stale_paths) < PARALLEL_THRESHOLD:
+            analyses = [self.analyze_file(file_path) for file_path in stale_paths]
+        else:
+            # ast.parse is CPU-bound, so spread files across worker processes
+            worker = partial(_analyze_one, cache_dir=self.cache_dir)
+            with ProcessPoolExecutor() as executor:
+                analyses = list(executor.map(worker, stale_paths, chunksize=8))
+
+        for (file_path, mtime_ns), analysis in zip(stale, analyses):
+            self._file_state[file_path] = (mtime_ns, analysis)
+
+        for file_path, _ in file_info:
+            analysis = self._file_state[file_path][1]
+            all_endpoints.extend(analysis.endpoints)
+            all_models.extend(analysis.models)
+
+            if analysis.app_title:
+                app_info['title'] = analysis.app_title
+            if analysis.app_description:
+                app_info['description'] = analysis.app_description
+            if analysis.app_version:
+                app_info['version'] = analysis.app_version
         
         return APIAnalysis(
             endpoints=all_endpoints,
@@ -120,68 +245,86 @@ class FastAPIAnalyzer:
             app_description=app_info.get('description'),
             app_version=app_info.get('version')
         )
-    
-    def _analyze_assignment(self, node: ast.Assign):
+
+    def rebuild(self) -> APIAnalysis:
+        """Re-analyze the last analyzed directory, reusing results for unchanged files"""
+        if self._last_directory is None:
+            raise RuntimeError("analyze_directory() must be called before rebuild()")
+        return self.analyze_directory(self._last_directory)
+
+    def generic_visit(self, node: ast.AST):
+        """Ignore statement types the analyzer has no visitor for, without descending"""
+
+    def visit_Assign(self, node: ast.Assign) -> Optional[Dict[str, Any]]:
         """Analyze assignment statements for FastAPI app creation"""
         if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
             target_name = node.targets[0].id
-            
+
             if target_name == 'app' and isinstance(node.value, ast.Call):
                 # FastAPI app creation
                 if isinstance(node.value.func, ast.Name) and node.value.func.id == 'FastAPI':
-                    self._extract_app_info(node.value)
-    
-    def _extract_app_info(self, call_node: ast.Call):
+                    return self._extract_app_info(node.value)
+        return None
+
+    def _extract_app_info(self, call_node: ast.Call) -> Dict[str, Any]:
         """Extract information from FastAPI app creation"""
+        app_info: Dict[str, Any] = {}
         for keyword in call_node.keywords:
-            if keyword.arg == 'title' and isinstance(keyword.value, ast.Constant):
-                self.app_info['title'] = keyword.value.value
-            elif keyword.arg == 'description' and isinstance(keyword.value, ast.Constant):
-                self.app_info['description'] = keyword.value.value
-            elif keyword.arg == 'version' and isinstance(keyword.value, ast.Constant):
-                self.app_info['version'] = keyword.value.value
-    
-    def _analyze_function(self, node: ast.FunctionDef):
+            if keyword.arg in APP_INFO_KEYS:
+                value = _const(keyword.value)
+                if value is not _MISSING:
+                    app_info[keyword.arg] = value
+        return app_info
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> List[APIEndpoint]:
         """Analyze function definitions for API endpoints"""
-        # Look for decorators that indicate API endpoints
+        endpoints = []
+        # Look for decorators like app.get, app.post, etc. A function may
+        # carry several route decorators, so collect one endpoint per match
         for decorator in node.decorator_list:
-            if isinstance(decorator, ast.Call):
-                if isinstance(decorator.func, ast.Attribute):
-                    # Check for app.get, app.post, etc.
-                    if (isinstance(decorator.func.value, ast.Name) and 
-                        decorator.func.value.id == 'app' and
-                        decorator.func.attr in ['get', 'post', 'put', 'delete', 'patch']):
-                        
-                        endpoint = self._create_endpoint(node, decorator)
-                        if endpoint:
-                            self.endpoints.append(endpoint)
+            func = getattr(decorator, 'func', None)
+            if not isinstance(func, ast.Attribute):
+                continue
+            method = HTTP_METHODS.get(func.attr)
+            if method is None:
+                continue
+            if isinstance(func.value, ast.Name) and func.value.id == 'app':
+                endpoint = self._create_endpoint(node, decorator, method)
+                if endpoint:
+                    endpoints.append(endpoint)
+        return endpoints
     
-    def _create_endpoint(self, func_node: ast.FunctionDef, decorator: ast.Call) -> Optional[APIEndpoint]:
-        """Create an APIEndpoint from function and decorator"""
-        method = decorator.func.attr.upper()
-        
+    def _create_endpoint(self, func_node: ast.FunctionDef, decorator: ast.Call,
+                         method: str) -> Optional[APIEndpoint]:
+        """Create an APIEndpoint from function, decorator and HTTP method"""
         # Extract path from decorator arguments
         path = "/"
-        if decorator.args and isinstance(decorator.args[0], ast.Constant):
-            path = decorator.args[0].value
-        
+        if decorator.args:
+            value = _const(decorator.args[0])
+            if value is not _MISSING:
+                path = value
+
         # Extract additional info from decorator keywords
         summary = None
         description = None
         tags = []
-        
+
         for keyword in decorator.keywords:
-            if keyword.arg == 'summary' and isinstance(keyword.value, ast.Constant):
-                summary = keyword.value.value
-            elif keyword.arg == 'description' and isinstance(keyword.value, ast.Constant):
-                description = keyword.value.value
+            if keyword.arg == 'summary':
+                value = _const(keyword.value)
+                if value is not _MISSING:
+                    summary = value
+            elif keyword.arg == 'description':
+                value = _const(keyword.value)
+                if value is not _MISSING:
+                    description = value
             elif keyword.arg == 'tags' and isinstance(keyword.value, ast.List):
-                tags = [item.value for item in keyword.value.elts if isinstance(item, ast.Constant)]
-        
+                tags = [value for value in map(_const, keyword.value.elts)
+                        if value is not _MISSING]
+
         # Extract docstring for description if not provided
-        if not description and func_node.body and isinstance(func_node.body[0], ast.Expr):
-            if isinstance(func_node.body[0].value, ast.Constant) and isinstance(func_node.body[0].value.value, str):
-                description = func_node.body[0].value.value.strip()
+        if not description:
+            description = ast.get_docstring(func_node)
         
         return APIEndpoint(
             path=path,
@@ -192,27 +335,22 @@ class FastAPIAnalyzer:
             tags=tags
         )
     
-    def _analyze_class(self, node: ast.ClassDef):
+    def visit_ClassDef(self, node: ast.ClassDef) -> Optional[APIModel]:
         """Analyze class definitions for Pydantic models"""
         # Check if it's a Pydantic model (BaseModel)
         for base in node.bases:
             if isinstance(base, ast.Name) and base.id == 'BaseModel':
-                model = self._create_model(node)
-                if model:
-                    self.models.append(model)
-                break
+                return self._create_model(node)
+        return None
     
     def _create_model(self, class_node: ast.ClassDef) -> Optional[APIModel]:
         """Create an APIModel from class definition"""
         fields = {}
-        description = None
+        description = ast.get_docstring(class_node)
         
-        # Extract docstring
-        if class_node.body and isinstance(class_node.body[0], ast.Expr):
-            if isinstance(class_node.body[0].value, ast.Constant) and isinstance(class_node.body[0].value.value, str):
-                description = class_node.body[0].value.value.strip()
-        
-        # Extract field definitions
+        # Extract field definitions. Pydantic fields are always direct
+        # AnnAssign children, so iterate class_node.body directly rather than
+        # walking the subtree, which would also pick up nested-class fields.
         for node in class_node.body:
             if isinstance(node, ast.AnnAssign):
                 if isinstance(node.target, ast.Name):
@@ -244,6 +382,11 @@ class FastAPIAnalyzer:
         return "Any"
 
 
+def _analyze_one(file_path: str, cache_dir: str) -> APIAnalysis:
+    """Analyze a single file in a worker process"""
+    return FastAPIAnalyzer(cache_dir=cache_dir).analyze_file(file_path)
+
+
 def main():
     """Example usage of the FastAPI analyzer"""
     analyzer = FastAPIAnalyzer()
@@ -262,4 +405,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main()
@@ -8,6 +8,7 @@ from fastapi import FastAPI, HTTPException, Path, Query, Body
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
+from itertools import islice
 import uuid
 from datetime import datetime
 
@@ -85,7 +86,7 @@ async def list_users(
     limit: int = Query(10, ge=1, le=100, description="Maximum number of users to return")
 ):
     """Get a list of users with optional filtering"""
-    users = list(users_db.values())[skip:skip + limit]
+    users = list(islice(users_db.values(), skip, skip + limit))
     
     return {
         "success": True,
@@ -109,4 +110,4 @@ async def get_user(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000)
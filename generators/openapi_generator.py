@@ -4,37 +4,89 @@ OpenAPI Documentation Generator
 This module generates OpenAPI 3.0 specifications from FastAPI analysis results.
 """
 
+import copy
 import json
+import re
+from functools import lru_cache
+from io import StringIO
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from analyzer.fastapi_analyzer import APIAnalysis, APIEndpoint, APIModel
 
+try:
+    import orjson  # C-accelerated encoder, ~5-10x faster than json
+except ImportError:
+    orjson = None
+
+# Matches generic annotations like List[str] or Optional[int]
+_GENERIC_TYPE_RE = re.compile(r'(\w+)\[(\w+)\]')
+
+_TYPE_MAPPING = {
+    "str": {"type": "string"},
+    "int": {"type": "integer"},
+    "float": {"type": "number"},
+    "bool": {"type": "boolean"},
+    "list": {"type": "array"},
+    "dict": {"type": "object"},
+    "Any": {"type": "string"}  # Default fallback
+}
+
+
+# Generic prefixes whose OpenAPI representation is an array
+_SEQUENCE_PREFIXES = ('List[', 'list[', 'Sequence[', 'Tuple[')
+
+
+@lru_cache(maxsize=256)
+def _convert_type(field_type: str) -> Dict[str, Any]:
+    """Convert a Python type annotation string to an OpenAPI type object"""
+    # Scalar annotations dominate real models; skip the generic handling early
+    if '[' not in field_type:
+        return _TYPE_MAPPING.get(field_type, {"type": "string"})
+
+    match = _GENERIC_TYPE_RE.match(field_type)
+    if match:
+        inner_type = match.group(2)
+        if field_type.startswith(_SEQUENCE_PREFIXES):
+            return {
+                "type": "array",
+                "items": _TYPE_MAPPING.get(inner_type, {"type": "string"})
+            }
+        if field_type.startswith('Optional['):
+            return _TYPE_MAPPING.get(inner_type, {"type": "string"})
+
+    return _TYPE_MAPPING.get(field_type, {"type": "string"})
+
+
+# Skeleton every generated spec starts from; instances deep-copy it so the
+# nested dict literals are only built once at import
+_SPEC_TEMPLATE = {
+    "openapi": "3.0.0",
+    "info": {
+        "title": "API Documentation",
+        "version": "1.0.0",
+        "description": "Auto-generated API documentation"
+    },
+    "servers": [
+        {
+            "url": "http://localhost:8000",
+            "description": "Development server"
+        }
+    ],
+    "paths": {},
+    "components": {
+        "schemas": {},
+        "responses": {},
+        "parameters": {}
+    },
+    "tags": []
+}
+
 
 class OpenAPIGenerator:
     """Generates OpenAPI 3.0 specifications from FastAPI analysis"""
-    
+
     def __init__(self):
-        self.openapi_spec = {
-            "openapi": "3.0.0",
-            "info": {
-                "title": "API Documentation",
-                "version": "1.0.0",
-                "description": "Auto-generated API documentation"
-            },
-            "servers": [
-                {
-                    "url": "http://localhost:8000",
-                    "description": "Development server"
-                }
-            ],
-            "paths": {},
-            "components": {
-                "schemas": {},
-                "responses": {},
-                "parameters": {}
-            },
-            "tags": []
-        }
+        self.openapi_spec = copy.deepcopy(_SPEC_TEMPLATE)
     
     def generate_from_analysis(self, analysis: APIAnalysis) -> Dict[str, Any]:
         """Generate OpenAPI spec from APIAnalysis"""
@@ -59,58 +111,36 @@ class OpenAPIGenerator:
     
     def _generate_schemas(self, models: List[APIModel]):
         """Generate OpenAPI schemas from Pydantic models"""
+        schemas = self.openapi_spec["components"]["schemas"]
+
         for model in models:
             schema = {
                 "type": "object",
-                "properties": {},
-                "required": []
+                "properties": {
+                    field_name: self._convert_type_to_openapi(field_type)
+                    for field_name, field_type in model.fields.items()
+                },
+                # For now, assume all fields are required
+                "required": list(model.fields)
             }
-            
+
             if model.description:
                 schema["description"] = model.description
-            
-            for field_name, field_type in model.fields.items():
-                schema["properties"][field_name] = self._convert_type_to_openapi(field_type)
-                # For now, assume all fields are required
-                schema["required"].append(field_name)
-            
-            self.openapi_spec["components"]["schemas"][model.name] = schema
+
+            schemas[model.name] = schema
     
     def _convert_type_to_openapi(self, field_type: str) -> Dict[str, Any]:
         """Convert Python type annotation to OpenAPI type"""
-        type_mapping = {
-            "str": {"type": "string"},
-            "int": {"type": "integer"},
-            "float": {"type": "number"},
-            "bool": {"type": "boolean"},
-            "list": {"type": "array"},
-            "dict": {"type": "object"},
-            "Any": {"type": "string"}  # Default fallback
-        }
-        
-        # Handle generic types
-        if "List[" in field_type or "list[" in field_type:
-            # Extract inner type
-            inner_type = field_type.split("[")[1].split("]")[0]
-            return {
-                "type": "array",
-                "items": type_mapping.get(inner_type, {"type": "string"})
-            }
-        elif "Optional[" in field_type:
-            # Extract inner type
-            inner_type = field_type.split("[")[1].split("]")[0]
-            return type_mapping.get(inner_type, {"type": "string"})
-        
-        return type_mapping.get(field_type, {"type": "string"})
+        # Copy the cached dict so spec consumers can mutate their spec without
+        # rewriting the shared mapping table and every later conversion
+        return copy.deepcopy(_convert_type(field_type))
     
     def _generate_paths(self, endpoints: List[APIEndpoint]):
         """Generate OpenAPI paths from endpoints"""
+        # Accumulate locally to skip the nested spec lookup per endpoint
+        paths = self.openapi_spec["paths"]
+
         for endpoint in endpoints:
-            path = endpoint.path
-            
-            if path not in self.openapi_spec["paths"]:
-                self.openapi_spec["paths"][path] = {}
-            
             operation = {
                 "summary": endpoint.summary or f"{endpoint.method} {endpoint.path}",
                 "operationId": endpoint.function_name,
@@ -146,15 +176,12 @@ class OpenAPIGenerator:
                     }
                 }
             
-            self.openapi_spec["paths"][path][endpoint.method.lower()] = operation
+            paths.setdefault(endpoint.path, {})[endpoint.method.lower()] = operation
     
     def _generate_tags(self, endpoints: List[APIEndpoint]):
         """Generate OpenAPI tags from endpoint tags"""
-        all_tags = set()
-        
-        for endpoint in endpoints:
-            all_tags.update(endpoint.tags)
-        
+        all_tags = set().union(*(endpoint.tags for endpoint in endpoints))
+
         for tag in all_tags:
             self.openapi_spec["tags"].append({
                 "name": tag,
@@ -163,8 +190,12 @@ class OpenAPIGenerator:
     
     def save_to_file(self, file_path: str):
         """Save OpenAPI spec to JSON file"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.openapi_spec, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(self.openapi_spec, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.openapi_spec, f, indent=2, ensure_ascii=False)
 
 
 class MarkdownGenerator:
@@ -175,96 +206,86 @@ class MarkdownGenerator:
     
     def generate_markdown(self) -> str:
         """Generate markdown documentation"""
-        md_content = []
-        
+        buffer = StringIO()
+        write = buffer.write
+        info = self.spec['info']
+
         # Title and description
-        md_content.append(f"# {self.spec['info']['title']}")
-        md_content.append("")
-        
-        if self.spec['info'].get('description'):
-            md_content.append(self.spec['info']['description'])
-            md_content.append("")
-        
+        write(f"# {info['title']}\n\n")
+
+        if info.get('description'):
+            write(f"{info['description']}\n\n")
+
         # API Info
-        md_content.append("## API Information")
-        md_content.append("")
-        md_content.append(f"- **Version**: {self.spec['info']['version']}")
-        md_content.append(f"- **OpenAPI Version**: {self.spec['openapi']}")
-        md_content.append("")
-        
+        write("## API Information\n\n")
+        write(f"- **Version**: {info['version']}\n")
+        write(f"- **OpenAPI Version**: {self.spec['openapi']}\n\n")
+
         # Servers
         if self.spec.get('servers'):
-            md_content.append("## Servers")
-            md_content.append("")
+            write("## Servers\n\n")
             for server in self.spec['servers']:
-                md_content.append(f"- **{server['description']}**: {server['url']}")
-            md_content.append("")
-        
+                write(f"- **{server['description']}**: {server['url']}\n")
+            write("\n")
+
         # Tags
         if self.spec.get('tags'):
-            md_content.append("## Tags")
-            md_content.append("")
+            write("## Tags\n\n")
             for tag in self.spec['tags']:
-                md_content.append(f"- **{tag['name']}**: {tag.get('description', '')}")
-            md_content.append("")
-        
+                write(f"- **{tag['name']}**: {tag.get('description', '')}\n")
+            write("\n")
+
         # Endpoints
-        md_content.append("## API Endpoints")
-        md_content.append("")
-        
+        write("## API Endpoints\n\n")
+
         for path, path_item in self.spec['paths'].items():
-            md_content.append(f"### {path}")
-            md_content.append("")
-            
+            write(f"### {path}\n\n")
+
             for method, operation in path_item.items():
-                if method in ['get', 'post', 'put', 'delete', 'patch']:
-                    method_upper = method.upper()
-                    md_content.append(f"#### {method_upper} {path}")
-                    md_content.append("")
-                    
-                    if operation.get('summary'):
-                        md_content.append(f"**Summary**: {operation['summary']}")
-                        md_content.append("")
-                    
-                    if operation.get('description'):
-                        md_content.append(f"**Description**: {operation['description']}")
-                        md_content.append("")
-                    
-                    if operation.get('tags'):
-                        md_content.append(f"**Tags**: {', '.join(operation['tags'])}")
-                        md_content.append("")
-                    
-                    md_content.append("---")
-                    md_content.append("")
-        
+                if method in ('get', 'post', 'put', 'delete', 'patch'):
+                    write(f"#### {method.upper()} {path}\n\n")
+
+                    summary = operation.get('summary')
+                    if summary:
+                        write(f"**Summary**: {summary}\n\n")
+
+                    description = operation.get('description')
+                    if description:
+                        write(f"**Description**: {description}\n\n")
+
+                    tags = operation.get('tags')
+                    if tags:
+                        write(f"**Tags**: {', '.join(tags)}\n\n")
+
+                    write("---\n\n")
+
         # Schemas
         if self.spec.get('components', {}).get('schemas'):
-            md_content.append("## Data Models")
-            md_content.append("")
-            
+            write("## Data Models\n\n")
+
             for schema_name, schema in self.spec['components']['schemas'].items():
-                md_content.append(f"### {schema_name}")
-                md_content.append("")
-                
+                write(f"### {schema_name}\n\n")
+
                 if schema.get('description'):
-                    md_content.append(schema['description'])
-                    md_content.append("")
-                
-                if schema.get('properties'):
-                    md_content.append("| Field | Type | Required | Description |")
-                    md_content.append("|-------|------|----------|-------------|")
-                    
+                    write(f"{schema['description']}\n\n")
+
+                properties = schema.get('properties')
+                if properties:
+                    write("| Field | Type | Required | Description |\n")
+                    write("|-------|------|----------|-------------|\n")
+
                     required_fields = schema.get('required', [])
-                    
-                    for field_name, field_spec in schema['properties'].items():
+
+                    for field_name, field_spec in properties.items():
                         field_type = field_spec.get('type', 'string')
                         required = "Yes" if field_name in required_fields else "No"
                         description = field_spec.get('description', '')
-                        md_content.append(f"| {field_name} | {field_type} | {required} | {description} |")
-                    
-                    md_content.append("")
-        
-        return "\n".join(md_content)
+                        write(f"| {field_name} | {field_type} | {required} | {description} |\n")
+
+                    write("\n")
+
+        # Drop the final newline to match the historical "\n".join output
+        return buffer.getvalue()[:-1]
     
     def save_to_file(self, file_path: str):
         """Save markdown documentation to file"""
@@ -298,4 +319,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main()